@@ -0,0 +1,9 @@
+import os
+from redis.asyncio import Redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")  # Render Key Value подставит сюда свой URL
+
+redis = Redis.from_url(
+    REDIS_URL,
+    decode_responses=True,  # отдаём str, а не bytes
+)
@@ -6,13 +6,19 @@ DATABASE_URL = os.getenv("DATABASE_URL")  # Render подставит сюда 
 
 engine = create_engine(
     DATABASE_URL,
+    pool_size=10,        # постоянные соединения в пуле
+    max_overflow=20,     # сколько можно открыть сверх pool_size под нагрузкой
+    pool_recycle=1800,   # пересоздаём соединения старше 30 минут
+    pool_use_lifo=True,  # берём последнее вернувшееся — «тёплое» соединение
     pool_pre_ping=True,  # предотвращает обрыв соединения
+    future=True,         # поведение SQLAlchemy 2.0
 )
 
 SessionLocal = sessionmaker(
-    autocommit=False,
+    bind=engine,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False,  # после commit не перечитываем объекты из БД
+    future=True,
 )
 
 Base = declarative_base()
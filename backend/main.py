@@ -1,9 +1,14 @@
 import os
+import hashlib
+import queue
 import smtplib
 import secrets
 import urllib.parse
 import time
-import requests
+import asyncio
+import httpx
+import orjson
+import numpy as np
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 import secrets
 from fastapi import Request, Response
@@ -12,26 +17,41 @@ from fastapi.responses import RedirectResponse
 from email.message import EmailMessage
 from datetime import datetime, timedelta, timezone
 from random import randint
+from contextlib import contextmanager, asynccontextmanager
 from pathlib import Path
+from types import MappingProxyType
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 
-from .database import Base, engine, SessionLocal
+from .database import SessionLocal
 from .models import User
+from .cache import redis
+from redis.exceptions import RedisError
 from dotenv import load_dotenv
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # при остановке закрываем общие клиенты (FINNHUB_CLIENT объявлен ниже)
+    await FINNHUB_CLIENT.aclose()
+    await redis.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 EMAIL_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 EMAIL_PORT = int(os.getenv("SMTP_PORT", "465"))  # 465 для SSL
 EMAIL_USER = os.getenv("SMTP_USER")             # логин почты
 EMAIL_PASSWORD = os.getenv("SMTP_PASSWORD")     # пароль / app password
 EMAIL_FROM = os.getenv("SMTP_FROM") or EMAIL_USER
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))  # сколько соединений держим открытыми
 
 ADMIN_JWT_SECRET = os.getenv("ADMIN_JWT_SECRET", "")
 ADMIN_COOKIE = "ax_admin"
@@ -60,10 +80,38 @@ def require_admin_fixed(credentials: HTTPBasicCredentials = Depends(security)):
         )
     return True
 
-# таблицы создаются один раз при старте приложения
-Base.metadata.create_all(bind=engine)
+# схема БД ведётся миграциями Alembic (alembic upgrade head при деплое),
+# на старте приложения таблицы не создаются
+
+# argon2 (C-реализация argon2-cffi); старые pbkdf2-хэши перехэшируются при входе
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated=["pbkdf2_sha256"],
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+)
+
+
+CODE_TTL = 10 * 60  # сек., столько живёт код подтверждения/сброса в Redis
+
+
+def _hash_code(code: str) -> str:
+    # в Redis храним только sha256 от кода подтверждения/сброса
+    return hashlib.sha256(code.encode()).hexdigest()
+
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# ---------- запросы по email ----------
+
+# собираются один раз при импорте; email подставляется через bindparam,
+# поэтому скомпилированный SQL берётся из кэша движка
+_USER_LOGIN_BY_EMAIL = select(
+    User.id, User.email, User.password_hash, User.is_verified, User.is_admin
+).where(User.email == bindparam("email"))
+
+_USER_ID_BY_EMAIL = select(User.id, User.email).where(User.email == bindparam("email"))
+
+_USER_SIGNUP_BY_EMAIL = select(User.id, User.is_verified).where(User.email == bindparam("email"))
 
 
 # ---------- Pydantic-схемы ----------
@@ -115,6 +163,64 @@ class OkResponse(BaseModel):
     ok: bool
     message: str | None = None
 
+# ---------- SMTP-пул ----------
+
+# соединения создаются лениво и возвращаются в пул после отправки,
+# чтобы не платить за TLS + AUTH на каждое письмо
+_smtp_pool: "queue.Queue[smtplib.SMTP_SSL]" = queue.Queue(maxsize=SMTP_POOL_SIZE)
+
+
+def _smtp_connect() -> smtplib.SMTP_SSL:
+    smtp = smtplib.SMTP_SSL(EMAIL_HOST, EMAIL_PORT, timeout=30)
+    try:
+        smtp.login(EMAIL_USER, EMAIL_PASSWORD)
+    except Exception:
+        # AUTH не прошёл — закрываем только что открытый сокет, иначе он утечёт
+        _smtp_close(smtp)
+        raise
+    return smtp
+
+
+def _smtp_close(smtp: smtplib.SMTP_SSL):
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
+
+
+@contextmanager
+def _get_conn():
+    try:
+        smtp = _smtp_pool.get_nowait()
+    except queue.Empty:
+        smtp = None
+
+    # сервер мог закрыть простаивающее соединение — проверяем через NOOP
+    if smtp is not None:
+        try:
+            alive = smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            alive = False
+        if not alive:
+            _smtp_close(smtp)
+            smtp = None
+
+    if smtp is None:
+        smtp = _smtp_connect()
+
+    try:
+        yield smtp
+    except Exception:
+        # после ошибки соединение в неизвестном состоянии — не возвращаем его
+        _smtp_close(smtp)
+        raise
+
+    try:
+        _smtp_pool.put_nowait(smtp)
+    except queue.Full:
+        _smtp_close(smtp)
+
+
 def send_reset_code_email(to_email: str, code: str):
     if not (EMAIL_HOST and EMAIL_USER and EMAIL_PASSWORD):
         raise RuntimeError("SMTP не настроен (нужны SMTP_HOST/SMTP_USER/SMTP_PASSWORD)")
@@ -128,72 +234,90 @@ def send_reset_code_email(to_email: str, code: str):
         f"Он действует 10 минут. Если вы не запрашивали сброс — игнорируйте письмо."
     )
 
-    with smtplib.SMTP_SSL(EMAIL_HOST, EMAIL_PORT) as smtp:
-        smtp.login(EMAIL_USER, EMAIL_PASSWORD)
+    with _get_conn() as smtp:
         smtp.send_message(msg)
 
 
-@app.post("/api/verify-email", response_model=VerifyEmailResponse)
-def verify_email(body: VerifyEmailRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == body.email).first()
-    if not user or not user.verification_code:
-        raise HTTPException(status_code=400, detail="Неверный код")
+# синхронная работа с БД для ручек ниже — вызывается через run_in_threadpool
+
+def _find_user(db: Session, email: str):
+    return db.execute(_USER_ID_BY_EMAIL, {"email": email}).one_or_none()
 
-    # текущее время в UTC с tzinfo
-    now = datetime.now(timezone.utc)
 
-    # сначала проверяем срок действия
-    if user.verification_expires_at and user.verification_expires_at < now:
-        raise HTTPException(status_code=400, detail="Срок действия кода истёк")
+def _mark_verified(db: Session, email: str) -> int | None:
+    user_id = db.execute(
+        update(User)
+        .where(User.email == email)
+        .values(is_verified=True)
+        .returning(User.id)
+    ).scalar_one_or_none()
+    db.commit()
+    return user_id
+
+
+def _set_password(db: Session, email: str, new_password: str) -> int | None:
+    password_hash = pwd_context.hash(new_password[:72])
+    user_id = db.execute(
+        update(User)
+        .where(User.email == email)
+        .values(password_hash=password_hash)
+        .returning(User.id)
+    ).scalar_one_or_none()
+    db.commit()
+    return user_id
+
+
+async def _consume_code(key: str, code: str):
+    # код живёт в Redis с TTL: нет ключа — код неверный или истёк
+    stored = await redis.get(key)
+    if not stored or not secrets.compare_digest(stored, _hash_code(code.strip())):
+        raise HTTPException(status_code=400, detail="Неверный код")
 
-    # потом сравниваем код
-    if user.verification_code != body.code.strip():
+    # код одноразовый: DELETE атомарен, из параллельных запросов пройдёт только один
+    if await redis.delete(key) == 0:
         raise HTTPException(status_code=400, detail="Неверный код")
 
+
+@app.post("/api/verify-email", response_model=VerifyEmailResponse)
+async def verify_email(body: VerifyEmailRequest, db: Session = Depends(get_db)):
+    await _consume_code(f"verify:{body.email}", body.code)
+
     # всё ок — помечаем как верифицированного
-    user.is_verified = True
-    user.verification_code = None
-    user.verification_expires_at = None
-    db.commit()
+    user_id = await run_in_threadpool(_mark_verified, db, body.email)
+    if user_id is None:
+        raise HTTPException(status_code=400, detail="Неверный код")
 
     return VerifyEmailResponse(ok=True)
 
 
 
 @app.post("/api/password-reset/request", response_model=OkResponse)
-def password_reset_request(body: PasswordResetRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == body.email).first()
+async def password_reset_request(
+    body: PasswordResetRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    user = await run_in_threadpool(_find_user, db, body.email)
     if not user:
         # чтобы не палить существование email
         return OkResponse(ok=True, message="Если email существует — код отправлен")
 
     code = f"{randint(100000, 999999)}"
-    user.reset_code = code
-    user.reset_expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
-    db.commit()
+    await redis.setex(f"reset:{user.email}", CODE_TTL, _hash_code(code))
 
-    send_reset_code_email(user.email, code)
+    # письмо уходит после ответа, SMTP не держит запрос
+    background_tasks.add_task(send_reset_code_email, user.email, code)
     return OkResponse(ok=True, message="Код отправлен")
 
 
 @app.post("/api/password-reset/confirm", response_model=OkResponse)
-def password_reset_confirm(body: PasswordResetConfirm, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == body.email).first()
-    if not user or not user.reset_code:
-        raise HTTPException(status_code=400, detail="Неверный код")
-
-    now = datetime.now(timezone.utc)
-    if user.reset_expires_at and user.reset_expires_at < now:
-        raise HTTPException(status_code=400, detail="Срок действия кода истёк")
+async def password_reset_confirm(body: PasswordResetConfirm, db: Session = Depends(get_db)):
+    await _consume_code(f"reset:{body.email}", body.code)
 
-    if user.reset_code != body.code.strip():
+    user_id = await run_in_threadpool(_set_password, db, body.email, body.new_password)
+    if user_id is None:
         raise HTTPException(status_code=400, detail="Неверный код")
 
-    user.password_hash = pwd_context.hash(body.new_password[:72])
-    user.reset_code = None
-    user.reset_expires_at = None
-    db.commit()
-
     return OkResponse(ok=True, message="Пароль изменён")
 
 @app.get("/api/admin/ping")
@@ -228,8 +352,8 @@ def require_admin(request: Request, db: Session = Depends(get_db)) -> User:
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid admin session")
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not getattr(user, "is_admin", False):
+    user = db.get(User, user_id)
+    if not user or not user.is_admin:
         raise HTTPException(status_code=403, detail="Admin only")
     return user
 
@@ -237,69 +361,88 @@ def require_admin(request: Request, db: Session = Depends(get_db)) -> User:
 
 # ---------- ручка регистрации ----------
 
-@app.post("/api/signup", response_model=SignupResponse)
-def signup(body: SignupRequest, db: Session = Depends(get_db)):
-    # проверяем, есть ли пользователь с таким email
-    existing = db.query(User).filter(User.email == body.email).first()
-
-    # генерируем код заранее
-    code = f"{randint(100000, 999999)}"
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+def _register_user(db: Session, body: SignupRequest) -> int:
+    # синхронная часть регистрации (БД + хэш), вызывается из пула потоков.
+    # порядок веток важен: хэш считаем только там, где он нужен
+    existing = db.execute(_USER_SIGNUP_BY_EMAIL, {"email": body.email}).one_or_none()
 
-    # 1. Пользователь существует и уже верифицирован → ошибка
+    # 1. Пользователь существует и уже верифицирован → ошибка, без хэша и кода
     if existing and existing.is_verified:
         raise HTTPException(
             status_code=400,
             detail="Пользователь уже зарегистрирован"
         )
 
-    # 2. Пользователь существует, но НЕ подтверждён → переотправляем код
-    if existing and not existing.is_verified:
-        existing.verification_code = code
-        existing.verification_expires_at = expires_at
-        db.commit()
+    # 2. Пользователь существует, но НЕ подтверждён → только новый код
+    if existing:
+        return existing.id
 
-        try:
-            send_verification_email(existing.email, code)
-        except Exception:
-            raise HTTPException(500, "Не удалось отправить письмо с кодом")
+    # 3. Новый пользователь → хэш пароля и INSERT
+    password_hash = pwd_context.hash(body.password[:72])
 
-        return {"ok": True, "id": existing.id}
+    # ON CONFLICT DO NOTHING: параллельная регистрация на тот же email не уронит запрос
+    user_id = db.execute(
+        pg_insert(User)
+        .values(
+            email=body.email,
+            password_hash=password_hash,
+            referral_code=body.referralCode or None,
+            is_verified=False,
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id)
+    ).scalar_one_or_none()
+    db.commit()
 
-    # 3. Новый пользователь → создаём
-    password_hash = pwd_context.hash(body.password[:72])
+    if user_id is None:
+        # параллельный запрос успел вставить этот email первым —
+        # если запись не подтверждена, это ветка 2 (новый код), а не ошибка
+        existing = db.execute(_USER_SIGNUP_BY_EMAIL, {"email": body.email}).one_or_none()
+        if existing and not existing.is_verified:
+            return existing.id
+        raise HTTPException(
+            status_code=400,
+            detail="Пользователь уже зарегистрирован"
+        )
+    return user_id
 
-    user = User(
-        email=body.email,
-        password_hash=password_hash,
-        referral_code=body.referralCode or None,
-        verification_code=code,
-        verification_expires_at=expires_at,
-        is_verified=False,
-    )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+@app.post("/api/signup", response_model=SignupResponse)
+async def signup(
+    body: SignupRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    # запросы к БД и хэширование блокирующие — уводим из event loop в пул потоков
+    user_id = await run_in_threadpool(_register_user, db, body)
 
-    try:
-        send_verification_email(user.email, code)
-    except Exception:
-        raise HTTPException(500, "Не удалось отправить письмо с кодом")
+    code = f"{randint(100000, 999999)}"
+
+    # новый код перекрывает старый
+    await redis.setex(f"verify:{body.email}", CODE_TTL, _hash_code(code))
+
+    # письмо отправляется в фоне, после того как ответ ушёл клиенту
+    background_tasks.add_task(send_verification_email, body.email, code)
 
-    return SignupResponse(ok=True, id=user.id)
+    return SignupResponse(ok=True, id=user_id)
 
 @app.post("/api/login", response_model=LoginResponse)
 def login(body: LoginRequest, db: Session = Depends(get_db)):
     # ищем пользователя по email
-    user = db.query(User).filter(User.email == body.email).first()
+    user = db.execute(_USER_LOGIN_BY_EMAIL, {"email": body.email}).one_or_none()
     if not user:
         raise HTTPException(status_code=401, detail="Неверный email или пароль")
 
-    # проверяем хэш пароля
-    if not pwd_context.verify(body.password[:72], user.password_hash):
+    # проверяем хэш пароля (обычный def — FastAPI и так выполняет ручку в пуле потоков)
+    ok, new_hash = pwd_context.verify_and_update(body.password[:72], user.password_hash)
+    if not ok:
         raise HTTPException(status_code=401, detail="Неверный email или пароль")
 
+    # хэш устаревшей схемы — сохраняем новый
+    if new_hash:
+        db.execute(update(User).where(User.id == user.id).values(password_hash=new_hash))
+        db.commit()
+
     return LoginResponse(ok=True, id=user.id, email=user.email)
 
 
@@ -317,21 +460,26 @@ def send_verification_email(to_email: str, code: str):
       f"Он действует 10 минут. Если вы не запрашивали этот код, просто игнорируйте письмо."
   )
 
-  # SSL-соединение (smtp.gmail.com:465, например)
-  with smtplib.SMTP_SSL(EMAIL_HOST, EMAIL_PORT) as smtp:
-      smtp.login(EMAIL_USER, EMAIL_PASSWORD)
+  # SSL-соединение из пула (smtp.gmail.com:465, например)
+  with _get_conn() as smtp:
       smtp.send_message(msg)
 
 @app.post("/api/admin/login", response_model=LoginResponse)
 def admin_login(body: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == body.email).first()
+    user = db.execute(_USER_LOGIN_BY_EMAIL, {"email": body.email}).one_or_none()
     if not user:
         raise HTTPException(status_code=401, detail="Неверный email или пароль")
 
-    if not pwd_context.verify(body.password[:72], user.password_hash):
+    ok, new_hash = pwd_context.verify_and_update(body.password[:72], user.password_hash)
+    if not ok:
         raise HTTPException(status_code=401, detail="Неверный email или пароль")
 
-    if not getattr(user, "is_admin", False):
+    # хэш устаревшей схемы — сохраняем новый
+    if new_hash:
+        db.execute(update(User).where(User.id == user.id).values(password_hash=new_hash))
+        db.commit()
+
+    if not user.is_admin:
         raise HTTPException(status_code=403, detail="Нет доступа")
 
     token = _admin_token(user.id)
@@ -357,22 +505,35 @@ def admin_ping(admin: User = Depends(require_admin_fixed)):
 
 
 FINNHUB_KEY = os.getenv("FINNHUB_KEY", "")
+# сколько секунд держим ответы Finnhub в Redis
+QUOTES_CACHE_TTL = int(os.getenv("QUOTES_CACHE_TTL", "10"))
+CANDLES_CACHE_TTL = int(os.getenv("CANDLES_CACHE_TTL", "45"))
+
+# один клиент на процесс: keep-alive + HTTP/2 к finnhub.io
+FINNHUB_CLIENT = httpx.AsyncClient(
+    base_url="https://finnhub.io/api/v1",
+    http2=True,
+    timeout=8,
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
+
+# таймфрейм фронта -> resolution Finnhub, собирается один раз
+_TF_MAP = MappingProxyType({
+    "1m": "1",
+    "5m": "5",
+    "15m": "15",
+    "30m": "30",
+    "1h": "60",
+    "1d": "D",
+    "1w": "W",
+    "1mo": "M",
+})
 
 def _tf_to_finnhub_res(tf: str) -> str:
-    tf = (tf or "1m").lower()
-    return {
-        "1m": "1",
-        "5m": "5",
-        "15m": "15",
-        "30m": "30",
-        "1h": "60",
-        "1d": "D",
-        "1w": "W",
-        "1mo": "M",
-    }.get(tf, "1")
+    return _TF_MAP.get(tf.casefold() if tf else "1m", "1")
 
 @app.get("/api/stocks/quotes")
-def api_stocks_quotes(symbols: str):
+async def api_stocks_quotes(symbols: str):
     """
     /api/stocks/quotes?symbols=AAPL,MSFT,NVDA
     -> { "AAPL": {"price": 123.45}, ... }
@@ -382,49 +543,108 @@ def api_stocks_quotes(symbols: str):
 
     out = {}
     syms = [s.strip().upper() for s in symbols.split(",") if s.strip()]
-    for sym in syms:
-        r = requests.get(
-            "https://finnhub.io/api/v1/quote",
-            params={"symbol": sym, "token": FINNHUB_KEY},
-            timeout=8,
-        )
-        j = r.json()
+    if not syms:
+        return out
+
+    # сначала одним MGET забираем всё, что есть в кэше;
+    # Redis недоступен — считаем, что в кэше ничего нет
+    try:
+        cached = await redis.mget([f"quote:{sym}" for sym in syms])
+    except RedisError:
+        cached = [None] * len(syms)
+    misses = []
+    for sym, raw in zip(syms, cached):
+        if raw is not None:
+            out[sym] = orjson.loads(raw)
+        else:
+            misses.append(sym)
+
+    # промахи запрашиваем у Finnhub параллельно
+    results = await asyncio.gather(
+        *(
+            FINNHUB_CLIENT.get("/quote", params={"symbol": sym, "token": FINNHUB_KEY})
+            for sym in misses
+        ),
+        return_exceptions=True,
+    )
+    fetched = {}
+    for sym, r in zip(misses, results):
+        # ошибка сети или не-2xx (429, 5xx) — просто пропускаем символ
+        if isinstance(r, Exception) or not r.is_success:
+            continue
+        try:
+            j = r.json()
+        except ValueError:
+            continue
         # c = current price
         if "c" in j and j["c"] is not None:
-            out[sym] = {"price": float(j["c"])}
+            fetched[sym] = {"price": float(j["c"])}
+
+    # новые котировки пишем в кэш одним запросом
+    if fetched:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for sym, quote in fetched.items():
+                    pipe.setex(f"quote:{sym}", QUOTES_CACHE_TTL, orjson.dumps(quote))
+                await pipe.execute()
+        except RedisError:
+            pass  # кэш необязателен, отдаём ответ и без него
+        out.update(fetched)
     return out
 
 
+# ответ свечей, когда данных нет (нет ключа, ошибка Finnhub и т.п.)
+_EMPTY_CANDLES = MappingProxyType({"t": [], "o": [], "h": [], "l": [], "c": []})
+
 @app.get("/api/stocks/candles")
-def api_stocks_candles(symbol: str, tf: str = "1m"):
+async def api_stocks_candles(symbol: str, tf: str = "1m"):
     """
     /api/stocks/candles?symbol=AAPL&tf=1m
-    -> [{t,o,h,l,c}, ...]  (t в миллисекундах)
+    -> {"t": [...], "o": [...], "h": [...], "l": [...], "c": [...]}
+       (колонки одинаковой длины; t — целые миллисекунды, o/h/l/c — float)
     """
     if not FINNHUB_KEY:
-        return []
+        return _EMPTY_CANDLES
 
     sym = symbol.strip().upper()
     resolution = _tf_to_finnhub_res(tf)
 
+    cache_key = f"candle:{sym}:{resolution}"
+    try:
+        cached = await redis.get(cache_key)
+    except RedisError:
+        cached = None
+    if cached is not None:
+        # в кэше уже готовый JSON — отдаём как есть
+        return Response(content=cached, media_type="application/json")
+
     to_ts = int(time.time())
     # окно истории: 3 дня (для минуток). Можешь увеличить.
     from_ts = to_ts - 3 * 24 * 60 * 60
 
-    r = requests.get(
-        "https://finnhub.io/api/v1/stock/candle",
-        params={
-            "symbol": sym,
-            "resolution": resolution,
-            "from": from_ts,
-            "to": to_ts,
-            "token": FINNHUB_KEY,
-        },
-        timeout=12,
-    )
-    j = r.json()
+    # таймаут/обрыв соединения — как и в котировках, просто нет данных
+    try:
+        r = await FINNHUB_CLIENT.get(
+            "/stock/candle",
+            params={
+                "symbol": sym,
+                "resolution": resolution,
+                "from": from_ts,
+                "to": to_ts,
+                "token": FINNHUB_KEY,
+            },
+            timeout=12,
+        )
+    except httpx.HTTPError:
+        return _EMPTY_CANDLES
+    if not r.is_success:
+        return _EMPTY_CANDLES
+    try:
+        j = r.json()
+    except ValueError:
+        return _EMPTY_CANDLES
     if j.get("s") != "ok":
-        return []
+        return _EMPTY_CANDLES
 
     t = j.get("t") or []
     o = j.get("o") or []
@@ -433,16 +653,21 @@ def api_stocks_candles(symbol: str, tf: str = "1m"):
     c = j.get("c") or []
 
     n = min(len(t), len(o), len(h), len(l), len(c))
-    return [
-        {
-            "t": int(t[i]) * 1000,   # ms
-            "o": float(o[i]),
-            "h": float(h[i]),
-            "l": float(l[i]),
-            "c": float(c[i]),
-        }
-        for i in range(n)
-    ]
+    # колонки numpy-массивами: orjson пишет их без обхода в Python,
+    # t отдельным int64, чтобы миллисекунды остались целыми
+    candles = {
+        "t": np.asarray(t[:n], dtype=np.int64) * 1000,  # ms
+        "o": np.asarray(o[:n], dtype=np.float64),
+        "h": np.asarray(h[:n], dtype=np.float64),
+        "l": np.asarray(l[:n], dtype=np.float64),
+        "c": np.asarray(c[:n], dtype=np.float64),
+    }
+    payload = orjson.dumps(candles, option=orjson.OPT_SERIALIZE_NUMPY)
+    try:
+        await redis.setex(cache_key, CANDLES_CACHE_TTL, payload)
+    except RedisError:
+        pass  # кэш необязателен, отдаём ответ и без него
+    return Response(content=payload, media_type="application/json")
 
 
 # ---------- отдаём фронтенд статикой ----------
@@ -0,0 +1,17 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from backend.database import Base, engine
+from backend import models  # noqa: F401 — регистрируем таблицы в Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# миграции всегда гоняются против живой базы (0001 смотрит, есть ли уже таблица),
+# поэтому offline-режим (--sql) не поддерживаем
+with engine.connect() as connection:
+    context.configure(connection=connection, target_metadata=Base.metadata)
+    with context.begin_transaction():
+        context.run_migrations()
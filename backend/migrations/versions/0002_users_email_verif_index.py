@@ -0,0 +1,24 @@
+"""index users (email, verification_code)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # на свежей базе индекс мог успеть создать create_all
+    op.create_index(
+        "ix_users_email_verif", "users", ["email", "verification_code"], if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_email_verif", table_name="users")
@@ -0,0 +1,29 @@
+"""store sha256 of verification/reset codes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # выданные раньше коды лежат открытым текстом и больше не совпадут — гасим их
+    op.execute("UPDATE users SET verification_code = NULL, reset_code = NULL")
+    with op.batch_alter_table("users") as batch:
+        batch.alter_column("verification_code", type_=sa.String(64), existing_nullable=True)
+        batch.alter_column("reset_code", type_=sa.String(64), existing_nullable=True)
+
+
+def downgrade():
+    op.execute("UPDATE users SET verification_code = NULL, reset_code = NULL")
+    with op.batch_alter_table("users") as batch:
+        batch.alter_column("verification_code", type_=sa.String(6), existing_nullable=True)
+        batch.alter_column("reset_code", type_=sa.String(6), existing_nullable=True)
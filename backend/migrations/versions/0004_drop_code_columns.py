@@ -0,0 +1,32 @@
+"""drop verification/reset code columns (codes live in Redis)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("ix_users_email_verif", table_name="users")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("verification_code")
+        batch.drop_column("verification_expires_at")
+        batch.drop_column("reset_code")
+        batch.drop_column("reset_expires_at")
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch:
+        batch.add_column(sa.Column("verification_code", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("verification_expires_at", sa.DateTime(timezone=True), nullable=True))
+        batch.add_column(sa.Column("reset_code", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("reset_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_users_email_verif", "users", ["email", "verification_code"])